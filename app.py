@@ -4,8 +4,13 @@ from pathlib import Path
 import pandas as pd
 import altair as alt
 import streamlit as st
-import colorsys
 from src.run_pipeline import main as run_pipeline
+from src.config import START_YEAR, END_YEAR
+from src.catalog import read_catalog, catalog_index, indicator_info
+from src.cube import load_cube, cube_from_frame
+from src.export import available_formats, export_cache_key, read_export, export_mime, export_extension
+from src.compare import Comparison, window_label
+from src.dimensions import REGION_DE, INCOME_DE, read_country_dim, color_map, country_color
 
 
 st.set_page_config(page_title="World-Bank-Dashboard", layout="wide")
@@ -14,18 +19,62 @@ ROOT = Path(__file__).resolve().parent
 DATA_PATH = ROOT / "data" / "processed" / "worldbank_clean.csv"
 
 st.title("World-Bank-Dashboard")
-st.caption("Datenquelle: World Bank API (letzte 5 Jahre)")
+st.caption(f"Datenquelle: World Bank API ({START_YEAR}-{END_YEAR})")
 
 
 @st.cache_data
 def load_data():
     return pd.read_csv(DATA_PATH)
 
+
+@st.cache_resource
+def load_catalog_index():
+    # Read-only Index einmal pro Prozess, nur fuer Indikatoren in den geladenen Daten
+    codes = load_data()["indicator_code"].dropna().unique()
+    return catalog_index(read_catalog(), codes)
+
+
+@st.cache_resource
+def load_cube_store():
+    # Wuerfel einmal pro Prozess: per mmap aus der Pipeline, sonst einmalig aus der CSV
+    return load_cube() or cube_from_frame(load_data())
+
+
+@st.cache_resource
+def load_country_meta():
+    # Eine Zeile je Land (Name, Region, Einkommen) als Maske fuer Abfragen auf dem Wuerfel
+    meta = (
+        load_data()
+        .drop_duplicates("country_code")[["country_code", "country_name_de", "region", "income_level"]]
+        .set_index("country_code")
+    )
+    meta["region_de"] = meta["region"].map(REGION_DE).fillna(meta["region"])
+    meta["income_level_de"] = meta["income_level"].map(INCOME_DE).fillna(meta["income_level"])
+    return meta
+
+
+@st.cache_resource
+def load_country_colors():
+    # Laender-Dimension einmal pro Prozess laden: deutscher Name -> feste Farbe
+    dim = read_country_dim()
+    return color_map(dim) if dim is not None else {}
+
+
+@st.cache_resource
+def load_comparison():
+    # Vergleichs-Engine auf dem Wuerfel; Ergebnisse je Indikator/Fenster im LRU-Cache
+    return Comparison(load_cube_store(), load_country_meta()[["country_name_de"]])
+
 st.sidebar.header("Aktionen")
 if st.sidebar.button("Daten aktualisieren"):
     with st.spinner("Daten werden geladen..."):
         run_pipeline()
     load_data.clear()
+    load_cube_store.clear()
+    load_country_meta.clear()
+    load_catalog_index.clear()
+    load_country_colors.clear()
+    load_comparison.clear()
     st.success("Aktualisierung abgeschlossen.")
 
 if not DATA_PATH.exists():
@@ -38,6 +87,9 @@ df = load_data()
 df = df.dropna(subset=["country_code", "indicator_code", "year", "value"])
 df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
 df["value"] = pd.to_numeric(df["value"], errors="coerce")
+cube = load_cube_store()
+country_meta = load_country_meta()
+comparison = load_comparison()
 
 st.sidebar.header("Filter")
 
@@ -47,11 +99,10 @@ indicators = (
     .drop_duplicates()
     .sort_values("indicator_name")
 )
+catalog = load_catalog_index()
 indicator_de = {
-    "SP.POP.TOTL": "Bevoelkerung",
-    "NY.GDP.MKTP.CD": "BIP (aktuelle US$)",
-    "GDP.PER.CAP.CALC": "BIP pro Kopf (berechnet)",
-    "SL.UEM.TOTL.ZS": "Arbeitslosenquote (%)",
+    code: indicator_info(catalog, code, name)["name_de"]
+    for code, name in zip(indicators["indicator_code"], indicators["indicator_name"])
 }
 indicators["indicator_name_de"] = indicators["indicator_code"].map(indicator_de).fillna(indicators["indicator_name"])
 indicator_names = indicators["indicator_name_de"].tolist()
@@ -66,24 +117,8 @@ max_year = int(df["year"].max())
 year_range = st.sidebar.slider("Zeitraum", min_year, max_year, (min_year, max_year))
 
 # Filter: Region / Einkommen
-region_de = {
-    "East Asia & Pacific": "Ostasien & Pazifik",
-    "Europe & Central Asia": "Europa & Zentralasien",
-    "Latin America & Caribbean": "Lateinamerika & Karibik",
-    "Middle East, North Africa, Afghanistan & Pakistan": "Nahost, Nordafrika, Afghanistan & Pakistan",
-    "North America": "Nordamerika",
-    "South Asia": "Suedasien",
-    "Sub-Saharan Africa": "Subsahara-Afrika",
-}
-income_de = {
-    "High income": "Hohes Einkommen",
-    "Upper middle income": "Oberes mittleres Einkommen",
-    "Lower middle income": "Unteres mittleres Einkommen",
-    "Low income": "Niedriges Einkommen",
-    "Not classified": "Nicht klassifiziert",
-}
-df["region_de"] = df["region"].map(region_de).fillna(df["region"])
-df["income_level_de"] = df["income_level"].map(income_de).fillna(df["income_level"])
+df["region_de"] = df["region"].map(REGION_DE).fillna(df["region"])
+df["income_level_de"] = df["income_level"].map(INCOME_DE).fillna(df["income_level"])
 regions = sorted(df["region_de"].dropna().unique().tolist())
 incomes = sorted(df["income_level_de"].dropna().unique().tolist())
 region_choice = st.sidebar.multiselect("Region", regions, default=regions)
@@ -133,31 +168,16 @@ if filtered.empty:
     st.warning("Keine Daten fuer die aktuelle Filterauswahl. Bitte Filter anpassen.")
     st.stop()
 
-# Ranking-Quelle: immer aus den uebrigen Regionen/Einkommensgruppen, ohne Laender-Filter
-rank_base = base_filtered
-
 st.sidebar.header("Darstellung")
 scale_choice = st.sidebar.selectbox("Skalierung", ["Linear", "Logarithmisch"])
 
-unit_label = "Wert"
-scale_factor = 1.0
-if ind_code == "SP.POP.TOTL":
-    unit_label = "Millionen"
-    scale_factor = 1e6
-elif ind_code == "NY.GDP.MKTP.CD":
-    unit_label = "Milliarden US$"
-    scale_factor = 1e9
-elif ind_code == "GDP.PER.CAP.CALC":
-    unit_label = "Tsd. US$"
-    scale_factor = 1e3
-elif ind_code == "SL.UEM.TOTL.ZS":
-    unit_label = "%"
-    scale_factor = 1.0
+# Einheit und Skalierung aus dem Indikator-Katalog
+ind_info = indicator_info(catalog, ind_code)
+unit_label = ind_info["unit_label"] or "Wert"
+scale_factor = float(ind_info["scale_factor"] or 1.0)
 
 latest_filtered = filtered[filtered["year"] == last_year].copy()
-latest_all_for_rank = rank_base[rank_base["year"] == last_year].copy()
 latest_filtered["value_scaled"] = (latest_filtered["value"] / scale_factor).round(2)
-latest_all_for_rank["value_scaled"] = (latest_all_for_rank["value"] / scale_factor).round(2)
 use_log = scale_choice == "Logarithmisch"
 if use_log and (filtered["value"] <= 0).any():
     st.warning("Logarithmische Skalierung ist nicht moeglich, weil Werte <= 0 vorhanden sind.")
@@ -178,24 +198,36 @@ col3.metric("Jahre", df["year"].nunique())
 
 # Farbskala fuer Laender (global)
 country_domain = df["country_name_de"].dropna().unique().tolist()
-color_range = []
-if country_domain:
-    # Eindeutige Farben pro Land (Hash + Golden-Angle)
-    for name in country_domain:
-        h = (hash(name) % 360) / 360.0
-        h = (h + 0.61803398875) % 1.0
-        s = 0.65 if (hash(name) % 2 == 0) else 0.8
-        v = 0.55 if (hash(name) % 3 == 0) else 0.7
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        color_range.append(f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}")
+# Feste Farben aus der Laender-Dimension, fehlende Laender deterministisch nachberechnen
+country_colors = load_country_colors()
+color_range = [country_colors.get(name) or country_color(name) for name in country_domain]
 color_scale = alt.Scale(domain=country_domain, range=color_range) if country_domain else alt.Scale()
 
 
 
+# Ranking-Laender: Region/Einkommen ueber die Laender-Tabelle statt ueber den Voll-Frame
+rank_countries = country_meta.index[
+    country_meta["region_de"].isin(region_choice)
+    & country_meta["income_level_de"].isin(income_choice)
+].tolist()
+
+
+def rank_latest(ascending):
+    # Ranking im letzten Jahr direkt aus dem Wuerfel
+    if not (year_range[0] <= last_year <= year_range[1]):
+        return pd.DataFrame(columns=["country_code", "value", "country_name_de", "value_scaled"])
+    ranked = cube.top_k(ind_code, last_year, k=10, countries=rank_countries, ascending=ascending)
+    ranked["country_name_de"] = ranked["country_code"].map(country_meta["country_name_de"])
+    ranked["value_scaled"] = (ranked["value"] / scale_factor).round(2)
+    return ranked
+
+
 # Chart 2: Top 10 im letzten Jahr
-top_count = min(10, len(latest_all_for_rank))
+top_current = rank_latest(ascending=False)
+bottom_current = rank_latest(ascending=True)
+top_count = len(top_current)
 st.subheader(f"Top {top_count} im letzten Jahr")
-top10 = latest_all_for_rank.sort_values("value", ascending=False).head(top_count)
+top10 = top_current
 bar = (
     alt.Chart(top10)
     .mark_bar()
@@ -211,8 +243,6 @@ st.altair_chart(bar, use_container_width=True)
 
 # Chart 2b: Top/Unterste 10 fuer den gewaehlten Indikator
 st.subheader(f"Top/Unterste {top_count} (aktuelles Jahr)")
-top_current = latest_all_for_rank.sort_values("value", ascending=False).head(top_count)
-bottom_current = latest_all_for_rank.sort_values("value", ascending=True).head(top_count)
 cc1, cc2 = st.columns(2)
 with cc1:
     st.caption("Top 10")
@@ -252,18 +282,23 @@ if country_choice:
 if heat_base.empty:
     st.info("Keine Daten fuer die Heatmap vorhanden.")
 else:
-    heat_base = heat_base.sort_values(["country_code", "year"])
-    heat_base["prev_value"] = heat_base.groupby("country_code")["value"].shift(1)
-    heat_base["delta_pct"] = ((heat_base["value"] - heat_base["prev_value"]) / heat_base["prev_value"]) * 100
-    heat_base = heat_base.dropna(subset=["delta_pct"])
+    # Vorjahresveraenderung aus der Vergleichs-Engine (1-Jahres-Fenster)
+    yoy = comparison.rolling(ind_code, 1)
+    heat_base = yoy[
+        (yoy["country_code"].isin(heat_base["country_code"].unique()))
+        & (yoy["year"] > int(heat_base["year"].min()))
+        & (yoy["year"] <= int(heat_base["year"].max()))
+    ].rename(columns={"rel_change_pct": "delta_pct"})
     # Top 10 Laender nach letzter Veraenderung
-    last_y = int(heat_base["year"].max())
-    last_slice = heat_base[heat_base["year"] == last_y].copy()
-    top_codes = (
-        last_slice.sort_values("delta_pct", ascending=False)
-        .head(10)["country_code"]
-        .tolist()
-    )
+    top_codes = []
+    if not heat_base.empty:
+        last_y = int(heat_base["year"].max())
+        last_slice = heat_base[heat_base["year"] == last_y].copy()
+        top_codes = (
+            last_slice.sort_values("delta_pct", ascending=False)
+            .head(10)["country_code"]
+            .tolist()
+        )
     heat_top = heat_base[heat_base["country_code"].isin(top_codes)].copy()
 
     if heat_top.empty:
@@ -301,11 +336,9 @@ if dumb_base.empty:
 else:
     start_y = int(dumb_base["year"].min())
     end_y = int(dumb_base["year"].max())
-    start_vals = dumb_base[dumb_base["year"] == start_y][["country_code", "country_name_de", "value"]].rename(columns={"value": "v_start"})
-    end_vals = dumb_base[dumb_base["year"] == end_y][["country_code", "country_name_de", "value"]].rename(columns={"value": "v_end"})
-    dumb = start_vals.merge(end_vals, on=["country_code", "country_name_de"])
-    dumb["delta"] = dumb["v_end"] - dumb["v_start"]
-    dumb = dumb.sort_values("delta", ascending=False).head(10)
+    dumb = comparison.change(ind_code, start_year=start_y, end_year=end_y)
+    dumb = dumb[dumb["country_code"].isin(dumb_base["country_code"].unique())]
+    dumb = dumb.sort_values("delta", ascending=False).head(10).copy()
     dumb["v_start_scaled"] = (dumb["v_start"] / scale_factor).round(2)
     dumb["v_end_scaled"] = (dumb["v_end"] / scale_factor).round(2)
 
@@ -342,15 +375,10 @@ else:
 
 # Chart 3: Relative Bevoelkerungsaenderung (Top/Unterste 10)
 if ind_code == "SP.POP.TOTL":
-    st.subheader("Bevoelkerungsveraenderung (relativ, 5 Jahre)")
-    pop = df[df["indicator_code"] == "SP.POP.TOTL"].copy()
-    first_year = int(pop["year"].min())
-    last_year = int(pop["year"].max())
-    first = pop[pop["year"] == first_year][["country_code", "value"]].rename(columns={"value": "v_start"})
-    last = pop[pop["year"] == last_year][["country_code", "value"]].rename(columns={"value": "v_end"})
-    meta = pop.drop_duplicates("country_code")[["country_code", "country_name_de"]]
-    change = meta.merge(first, on="country_code").merge(last, on="country_code")
-    change["rel_change_pct"] = ((change["v_end"] - change["v_start"]) / change["v_start"]) * 100
+    change = comparison.change("SP.POP.TOTL").copy()
+    first_year = int(change["start_year"].min())
+    last_year = int(change["end_year"].max())
+    st.subheader(f"Bevoelkerungsveraenderung (relativ, {window_label(first_year, last_year)})")
     change["rel_change_pct"] = pd.to_numeric(change["rel_change_pct"], errors="coerce").round(2)
     change = change.dropna(subset=["rel_change_pct"])
 
@@ -461,11 +489,32 @@ st.dataframe(table_df, use_container_width=True)
 
 st.caption(f"Wert = {indicator_choice} in {unit_label}.")
 
-st.download_button(
-    "Gefilterte Daten als CSV",
-    data=filtered.to_csv(index=False).encode("utf-8"),
-    file_name="worldbank_filtered.csv",
-    mime="text/csv",
-)
+# Export erst auf Anfrage erzeugen (Datei-Cache je Filterzustand)
+export_format = st.selectbox("Export-Format", available_formats())
+export_key = export_cache_key({
+    "indicator": ind_code,
+    "years": list(year_range),
+    "regions": sorted(region_choice),
+    "incomes": sorted(income_choice),
+    "countries": sorted(country_choice),
+    "format": export_format,
+}, DATA_PATH)
+# Download-Button nur im Lauf, in dem der Export angefordert wurde
+if st.button("Export erstellen"):
+    with st.spinner("Export wird erstellt..."):
+        try:
+            export_data = read_export(filtered, export_format, export_key)
+        except FileNotFoundError:
+            # Datei wurde parallel aus dem Cache entfernt
+            export_data = None
+    if export_data is None:
+        st.warning("Export konnte nicht gelesen werden. Bitte erneut erstellen.")
+    else:
+        st.download_button(
+            f"Gefilterte Daten als {export_format}",
+            data=export_data,
+            file_name=f"worldbank_filtered.{export_extension(export_format)}",
+            mime=export_mime(export_format),
+        )
 
 st.caption("Quelle: World Bank API (https://api.worldbank.org/v2)")
@@ -0,0 +1,153 @@
+# bench_fetch.py
+# Vergleicht den synchronen requests-Abruf mit dem asyncio/httpx-Client
+# gegen einen lokalen Stand-in-Server (kein Zugriff auf die echte API).
+#
+# Aufruf (aus dem Projekt-Root):
+#   python -m benchmarks.bench_fetch --indicators 50 --page-size 500 --latency-ms 5
+#
+# Hinweis: der Stand-in-Server spricht nur HTTP/1.1; HTTP/2 laesst sich nur
+# gegen einen Server mit h2-Unterstuetzung messen.
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src import fetch_api, fetch_async
+
+
+def _country(i):
+    return {
+        "id": f"C{i:02d}",
+        "iso2Code": f"{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}",
+        "name": f"Country {i}",
+        "region": {"value": "Europe & Central Asia"},
+        "incomeLevel": {"value": "High income"},
+        "capitalCity": "Capital",
+        "latitude": "1.0",
+        "longitude": "2.0",
+    }
+
+
+def _make_handler(n_countries, n_years, page_size, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = parse_qs(url.query)
+            per_page = min(int(q.get("per_page", ["50"])[0]), page_size)
+            page = int(q.get("page", ["1"])[0])
+            parts = url.path.strip("/").split("/")
+            if parts[-1] == "country":
+                total = n_countries
+                make = _country
+            else:
+                code = parts[-1]
+                total = n_countries * n_years
+
+                def make(i):
+                    c = _country(i % n_countries)
+                    return {
+                        "country": {"id": c["iso2Code"], "value": c["name"]},
+                        "indicator": {"id": code, "value": code},
+                        "date": str(2000 + i // n_countries),
+                        "value": float(i),
+                    }
+            start = (page - 1) * per_page
+            records = [make(i) for i in range(start, min(start + per_page, total))]
+            pages = max(1, -(-total // per_page))
+            body = json.dumps([
+                {"page": page, "pages": pages, "per_page": per_page, "total": total},
+                records,
+            ]).encode("utf-8")
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def _serve(port, n_countries, n_years, page_size, latency, ready):
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(n_countries, n_years, page_size, latency))
+    server.daemon_threads = True
+    ready.set()
+    server.serve_forever()
+
+
+def _fetch(backend, base_url, countries, codes):
+    if backend == "requests":
+        # Sync-Pfad ohne Schlafpausen, damit nur der Transport verglichen wird
+        fetch_api.BASE_URL = base_url
+        fetch_api.SLEEP_SEC = 0
+        return fetch_api.fetch_indicator_data_all(countries, codes)
+    return fetch_async.fetch_indicator_data_all(countries, codes, base_url=base_url)
+
+
+def _peak_rss(backend, base_url, countries, codes):
+    # Laeuft in einem frischen Prozess: ru_maxrss enthaelt dann nur diesen Abruf (Linux: KiB)
+    _fetch(backend, base_url, countries, codes)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure(backend, base_url, countries, codes, n_requests):
+    # Zeit/CPU in einem ungetracten Durchlauf, Speicher-Peak separat im Kindprozess
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    df = _fetch(backend, base_url, countries, codes)
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        peak = pool.apply(_peak_rss, (backend, base_url, countries, codes))
+    print(
+        f"{backend:<10} rows={len(df):>8}  wall={wall:7.2f}s  "
+        f"req/s={n_requests / wall:8.1f}  cpu={cpu:6.2f}s  peak_rss={peak / 1e6:7.1f} MB"
+    )
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark: requests vs. asyncio/httpx")
+    parser.add_argument("--indicators", type=int, default=50)
+    parser.add_argument("--countries", type=int, default=217)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # Server in eigenem Prozess, damit dessen CPU nicht mitgemessen wird
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=_serve,
+        args=(args.port, args.countries, args.years, args.page_size, args.latency_ms / 1000, ready),
+        daemon=True,
+    )
+    server.start()
+    ready.wait()
+    base_url = f"http://127.0.0.1:{args.port}/v2"
+
+    codes = [f"BENCH.{i:04d}" for i in range(args.indicators)]
+    pages = -(-(args.countries * args.years) // args.page_size)
+    n_requests = len(codes) * pages
+
+    fetch_api.BASE_URL = base_url
+    fetch_api.SLEEP_SEC = 0
+    countries = fetch_api.get_countries()
+    print(f"{len(codes)} Indikatoren x {pages} Seiten = {n_requests} Requests")
+    sync_df = _measure("requests", base_url, countries, codes, n_requests)
+    async_df = _measure("async", base_url, countries, codes, n_requests)
+    print(f"Gleiches Ergebnis: {sync_df.equals(async_df)}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,5 @@ from pathlib import Path
 
 if __name__ == "__main__":
     root = Path(__file__).resolve().parent
-    subprocess.run([sys.executable, "-m", "src.run_pipeline"], cwd=str(root), check=True)
+    # Argumente (z.B. --workers 4) an die Pipeline durchreichen
+    subprocess.run([sys.executable, "-m", "src.run_pipeline", *sys.argv[1:]], cwd=str(root), check=True)
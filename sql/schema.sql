@@ -6,12 +6,23 @@ CREATE TABLE IF NOT EXISTS countries (
   iso3 TEXT,
   name TEXT,
   region TEXT,
-  income_level TEXT
+  income_level TEXT,
+  region_de TEXT,
+  income_level_de TEXT,
+  is_sovereign INTEGER,
+  color TEXT
 );
 CREATE TABLE IF NOT EXISTS indicators (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   code TEXT UNIQUE,
-  name TEXT
+  name TEXT,
+  name_de TEXT,
+  unit TEXT,
+  unit_label TEXT,
+  scale_factor REAL,
+  source TEXT,
+  topic_ids TEXT,
+  topics TEXT
 );
 CREATE TABLE IF NOT EXISTS facts (
   country_id INTEGER,
@@ -0,0 +1,203 @@
+# catalog.py
+# Indikator-Katalog: Metadaten der World Bank API (/indicator) mit lokalem Cache
+import json
+import time
+import pandas as pd
+from src.config import CATALOG_CSV, CATALOG_META, INDICATORS, INDICATOR_TOPICS
+from src.fetch_api import _fetch_paged
+
+CATALOG_COLUMNS = [
+    "code",
+    "name",
+    "name_de",
+    "unit",
+    "unit_label",
+    "scale_factor",
+    "source",
+    "topic_ids",
+    "topics",
+]
+
+# Feste Anzeige-Werte fuer bekannte und selbst berechnete Indikatoren
+INDICATOR_OVERRIDES = {
+    "SP.POP.TOTL": {
+        "name_de": "Bevoelkerung",
+        "unit_label": "Millionen",
+        "scale_factor": 1e6,
+    },
+    "NY.GDP.MKTP.CD": {
+        "name_de": "BIP (aktuelle US$)",
+        "unit_label": "Milliarden US$",
+        "scale_factor": 1e9,
+    },
+    "GDP.PER.CAP.CALC": {
+        "name": "GDP per capita (calc)",
+        "name_de": "BIP pro Kopf (berechnet)",
+        "unit_label": "Tsd. US$",
+        "scale_factor": 1e3,
+        "source": "Berechnet",
+    },
+    "SL.UEM.TOTL.ZS": {
+        "name_de": "Arbeitslosenquote (%)",
+        "unit_label": "%",
+        "scale_factor": 1.0,
+    },
+}
+
+
+def _derive_unit(code, name, unit):
+    # Einheit und Skalierung heuristisch aus Code/Name ableiten
+    name = name or ""
+    if unit == "%" or "%" in name:
+        return "%", 1.0
+    if "US$" in name:
+        if "per capita" in name:
+            return "Tsd. US$", 1e3
+        return "Milliarden US$", 1e9
+    if code.startswith("SP.POP.") and code.endswith(".TOTL"):
+        return "Millionen", 1e6
+    return "Wert", 1.0
+
+
+def _catalog_row(r):
+    code = r.get("id")
+    name = r.get("name")
+    unit = str(r.get("unit") or "").strip()
+    unit_label, scale_factor = _derive_unit(code, name, unit)
+    topics = [t for t in (r.get("topics") or []) if t.get("id")]
+    return {
+        "code": code,
+        "name": name,
+        "name_de": name,
+        "unit": unit,
+        "unit_label": unit_label,
+        "scale_factor": scale_factor,
+        "source": (r.get("source") or {}).get("value", ""),
+        # Mit Trennzeichen am Rand, damit die Topic-Suche exakt matcht
+        "topic_ids": ";" + ";".join(str(t["id"]).strip() for t in topics) + ";",
+        "topics": "; ".join(str(t.get("value", "")).strip() for t in topics),
+    }
+
+
+def _apply_overrides(catalog):
+    known = set(catalog["code"])
+    missing = [
+        {
+            "code": code,
+            "name": code,
+            "name_de": code,
+            "unit": "",
+            "unit_label": "Wert",
+            "scale_factor": 1.0,
+            "source": "",
+            "topic_ids": ";",
+            "topics": "",
+        }
+        for code in INDICATOR_OVERRIDES
+        if code not in known
+    ]
+    if missing:
+        catalog = pd.concat([catalog, pd.DataFrame(missing, columns=CATALOG_COLUMNS)], ignore_index=True)
+    catalog = catalog.set_index("code")
+    for code, values in INDICATOR_OVERRIDES.items():
+        for col, val in values.items():
+            catalog.loc[code, col] = val
+    return catalog.reset_index()
+
+
+def _catalog_frame(records):
+    rows = [_catalog_row(r) for r in records if r.get("id")]
+    return pd.DataFrame(rows, columns=CATALOG_COLUMNS).drop_duplicates("code")
+
+
+def fetch_catalog():
+    # Holt alle Indikator-Metadaten (Name, Einheit, Quelle, Topics), ~29k Eintraege
+    return _catalog_frame(_fetch_paged("/indicator"))
+
+
+def fetch_indicator_meta(codes):
+    # Metadaten einzelner Indikatoren; Codes, die die API nicht kennt, fehlen im Ergebnis
+    records = []
+    for code in codes:
+        records += _fetch_paged(f"/indicator/{code}")
+    return _catalog_frame(records)
+
+
+def _read_cached():
+    # Rohdaten aus dem Cache (ohne Overrides)
+    if CATALOG_CSV.exists():
+        return pd.read_csv(CATALOG_CSV, dtype={"topic_ids": str}, keep_default_na=False)
+    return pd.DataFrame(columns=CATALOG_COLUMNS)
+
+
+def _cache_is_full():
+    if not (CATALOG_CSV.exists() and CATALOG_META.exists()):
+        return False
+    with open(CATALOG_META, "r", encoding="utf-8") as f:
+        return bool(json.load(f).get("full"))
+
+
+def read_catalog():
+    # Liest den Cache ohne Netzwerkzugriff (Fallback: nur bekannte Indikatoren)
+    return _apply_overrides(_read_cached())
+
+
+def load_catalog(topics=None, refresh=False):
+    # Komplette Liste nur fuer die Topic-Auswahl; sonst fehlende Codes einzeln nachladen
+    topics = INDICATOR_TOPICS if topics is None else topics
+    cached = _read_cached()
+    full = _cache_is_full()
+    changed = False
+    if topics and (refresh or not full):
+        cached, full, changed = fetch_catalog(), True, True
+    codes = resolve_indicators(_apply_overrides(cached), topics)
+    known = set(cached["code"]) if not refresh or changed else set()
+    missing = [c for c in codes if c not in known]
+    if missing:
+        fetched = fetch_indicator_meta(missing)
+        cached = pd.concat([cached[~cached["code"].isin(fetched["code"])], fetched], ignore_index=True)
+        changed = True
+    if changed:
+        CATALOG_CSV.parent.mkdir(parents=True, exist_ok=True)
+        cached.to_csv(CATALOG_CSV, index=False)
+        with open(CATALOG_META, "w", encoding="utf-8") as f:
+            json.dump({"full": full, "fetched_at": time.time()}, f)
+    return _apply_overrides(cached)
+
+
+def catalog_index(catalog, codes=None):
+    # Dict code -> Metadaten fuer schnelle Lookups; optional nur fuer die geladenen Codes
+    catalog = catalog.drop_duplicates("code")
+    if codes is not None:
+        catalog = catalog[catalog["code"].isin(codes)]
+    return catalog.set_index("code").to_dict("index")
+
+
+def indicator_info(index, code, fallback_name=None):
+    # Anzeige-Infos fuer einen Indikator; unbekannte Codes bekommen Standardwerte
+    info = index.get(code)
+    if info is None:
+        name = fallback_name or code
+        return {"name": name, "name_de": name, "unit_label": "Wert", "scale_factor": 1.0}
+    return info
+
+
+def indicators_for_topics(catalog, topics):
+    # Indikator-Codes fuer eine Liste von Topic-IDs
+    if not topics:
+        return []
+    topic_ids = catalog["topic_ids"].fillna(";")
+    mask = pd.Series(False, index=catalog.index)
+    for topic in topics:
+        mask |= topic_ids.str.contains(f";{topic};", regex=False)
+    return catalog.loc[mask, "code"].tolist()
+
+
+def resolve_indicators(catalog, topics=None):
+    # Feste Indikatoren aus der Config plus alle Indikatoren der gewaehlten Topics
+    topics = INDICATOR_TOPICS if topics is None else topics
+    codes = list(INDICATORS.keys())
+    for code in indicators_for_topics(catalog, [str(t) for t in topics]):
+        if code not in codes:
+            codes.append(code)
+    return codes
@@ -0,0 +1,137 @@
+# compare.py
+# Vergleichs-Engine auf dem Wuerfel: Veraenderungen ueber beliebige Zeitfenster je Indikator
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.config import COMPARE_CACHE_SIZE
+from src.cube import cube_from_frame
+
+CHANGE_COLUMNS = [
+    "indicator_code",
+    "country_code",
+    "start_year",
+    "end_year",
+    "v_start",
+    "v_end",
+    "delta",
+    "rel_change_pct",
+    "cagr_pct",
+]
+ROLLING_COLUMNS = ["indicator_code", "country_code", "year", "rel_change_pct"]
+
+
+def window_label(start_year, end_year):
+    # Beschriftung passend zum tatsaechlich berechneten Zeitraum
+    return f"{int(end_year) - int(start_year)} Jahre, {int(start_year)}-{int(end_year)}"
+
+
+def country_meta(df: pd.DataFrame):
+    # Laendernamen je Code fuer die Ergebnis-Tabellen
+    name_cols = [c for c in ["country_name", "country_name_de"] if c in df.columns]
+    return df.drop_duplicates("country_code").set_index("country_code")[name_cols]
+
+
+class Comparison:
+    # Rechnet direkt auf dem Array des Wuerfels; Ergebnisse je (Indikator, Fenster) im LRU-Cache
+    def __init__(self, cube, meta=None, cache_size=COMPARE_CACHE_SIZE):
+        self.cube = cube
+        self.meta = meta
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, cache_size=COMPARE_CACHE_SIZE):
+        return cls(cube_from_frame(df), country_meta(df), cache_size)
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _frame(self, indicator, country_idx, columns):
+        frame = pd.DataFrame({
+            "indicator_code": indicator,
+            "country_code": [self.cube.countries[i] for i in country_idx],
+            **columns,
+        })
+        if self.meta is not None:
+            for col in self.meta.columns:
+                frame[col] = frame["country_code"].map(self.meta[col])
+        return frame
+
+    def bounds(self, indicator):
+        # Erstes/letztes Jahr mit Daten fuer einen Indikator (None, wenn keine Daten)
+        if indicator not in self.cube.indicator_pos:
+            return None
+        has_data = np.flatnonzero(~np.isnan(self.cube.series(indicator)).all(axis=0))
+        if has_data.size == 0:
+            return None
+        return self.cube.years[has_data[0]], self.cube.years[has_data[-1]]
+
+    def change(self, indicator, years=None, start_year=None, end_year=None):
+        # Start-/Endwert, Delta, relative Veraenderung und CAGR je Land.
+        # Ohne Angaben: erstes bis letztes Jahr des Indikators; years=N: letzte N Jahre.
+        key = ("change", indicator, years, start_year, end_year)
+        return self._cached(key, lambda: self._change(indicator, years, start_year, end_year))
+
+    def _change(self, indicator, years, start_year, end_year):
+        bounds = self.bounds(indicator)
+        if bounds is None:
+            return pd.DataFrame(columns=CHANGE_COLUMNS)
+        end = int(end_year) if end_year is not None else bounds[1]
+        if start_year is not None:
+            start = int(start_year)
+        elif years is not None:
+            start = end - int(years)
+        else:
+            start = bounds[0]
+        pos = self.cube.year_pos
+        if start not in pos or end not in pos:
+            return pd.DataFrame(columns=CHANGE_COLUMNS)
+        values = self.cube.series(indicator)
+        v_start = np.asarray(values[:, pos[start]])
+        v_end = np.asarray(values[:, pos[end]])
+        idx = np.flatnonzero(~np.isnan(v_start) & ~np.isnan(v_end))
+        v_start, v_end = v_start[idx], v_end[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel = (v_end - v_start) / v_start * 100
+            cagr = (np.power(v_end / v_start, 1.0 / (end - start)) - 1) * 100 if end > start else np.full(idx.size, np.nan)
+        result = self._frame(indicator, idx, {
+            "start_year": start,
+            "end_year": end,
+            "v_start": v_start,
+            "v_end": v_end,
+            "delta": v_end - v_start,
+            "rel_change_pct": rel,
+            "cagr_pct": cagr,
+        })
+        return result.replace([np.inf, -np.inf], np.nan)
+
+    def rolling(self, indicator, years=1):
+        # Veraenderung zu N Jahren zuvor fuer jedes Jahr (Long-Format)
+        key = ("rolling", indicator, years)
+        return self._cached(key, lambda: self._rolling(indicator, int(years)))
+
+    def _rolling(self, indicator, n):
+        if indicator not in self.cube.indicator_pos:
+            return pd.DataFrame(columns=ROLLING_COLUMNS)
+        values = np.asarray(self.cube.series(indicator))
+        delta = np.full(values.shape, np.nan)
+        if 0 < n < values.shape[1]:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                delta[:, n:] = (values[:, n:] - values[:, :-n]) / values[:, :-n] * 100
+        delta[~np.isfinite(delta)] = np.nan
+        country_idx, year_idx = np.nonzero(~np.isnan(delta))
+        return self._frame(indicator, country_idx, {
+            "year": np.asarray(self.cube.years, dtype=int)[year_idx],
+            "rel_change_pct": delta[country_idx, year_idx],
+        })
@@ -10,7 +10,16 @@ INDICATORS = {
     "NY.GDP.MKTP.CD": "GDP (current US$)",
     "SL.UEM.TOTL.ZS": "Unemployment, total (% of total labor force)",
 }
+# Zusaetzliche Indikatoren nach World-Bank-Topic-ID laden (z.B. "3" = Economy & Growth)
+INDICATOR_TOPICS = []
 SLEEP_SEC = 0.1
+# Abruf-Backend: "requests" (seriell) oder "async" (httpx, viele Requests gleichzeitig)
+FETCH_BACKEND = "requests"
+ASYNC_MAX_IN_FLIGHT = 200
+ASYNC_MAX_CONNECTIONS = 4
+HTTP2 = False
+# Laendernamen in diesen Sprachen in der Laender-Dimension ablegen
+COUNTRY_NAME_LOCALES = ["de", "en", "fr"]
 ROOT = Path(__file__).resolve().parents[1]
 RAW_CSV = ROOT / "data" / "raw" / "worldbank_raw.csv"
 CLEAN_CSV = ROOT / "data" / "processed" / "worldbank_clean.csv"
@@ -19,4 +28,26 @@ PLOT_PATH = ROOT / "reports" / "figures" / "top_population.png"
 PLOT_POP_CHANGE_TOP = ROOT / "reports" / "figures" / "population_change_top10.png"
 PLOT_POP_CHANGE_BOTTOM = ROOT / "reports" / "figures" / "population_change_bottom10.png"
 PLOT_GDP_PC = ROOT / "reports" / "figures" / "top_gdp_per_capita.png"
+FIG_BATCH_DIR = ROOT / "reports" / "figures" / "indicators"
+# Ausgabeformate fuer Plots (z.B. ["png", "svg", "pdf"]) und Aufloesung fuer Rastergrafiken
+FIG_FORMATS = ["png"]
+FIG_DPI = 150
+# Small Multiples: feste Anzahl Indikatoren je Seite (3 Spalten x 4 Zeilen)
+FIG_GRID_PER_PAGE = 12
+FIG_GRID_COLS = 3
+EDA_REPORT_HTML = ROOT / "reports" / "eda_report.html"
+EDA_REPORT_META = ROOT / "reports" / "eda_report_meta.json"
+# Anzahl gecachter Vergleichs-Ergebnisse (je Indikator und Zeitfenster)
+COMPARE_CACHE_SIZE = 32
+CUBE_DIR = ROOT / "data" / "processed" / "cube"
+CUBE_INDEX_NAME = "cube_index.json"
+COUNTRY_DIM_CSV = ROOT / "data" / "processed" / "country_dim.csv"
+COUNTRY_DIM_META = ROOT / "data" / "processed" / "country_dim_meta.json"
+CATALOG_CSV = ROOT / "data" / "processed" / "indicator_catalog.csv"
+# Merkt sich, ob der Cache die komplette /indicator-Liste enthaelt (nur fuer Topics noetig)
+CATALOG_META = ROOT / "data" / "processed" / "indicator_catalog_meta.json"
+EXPORT_DIR = ROOT / "data" / "exports"
+# Anzahl gecachter Export-Dateien und Zeilen pro geschriebenem Block
+EXPORT_CACHE_MAX = 20
+EXPORT_CHUNK_ROWS = 50000
 SCHEMA_PATH = ROOT / "sql" / "schema.sql"
@@ -0,0 +1,137 @@
+# cube.py
+# Dichter Daten-Wuerfel (Land x Indikator x Jahr) als memory-mapped NumPy-Array
+import json
+import os
+import uuid
+import numpy as np
+import pandas as pd
+from src.config import CUBE_DIR, CUBE_INDEX_NAME
+
+
+class Cube:
+    # Haelt das Array (NaN = fehlender Wert) und die Index-Maps je Achse
+    def __init__(self, data, countries, indicators, years):
+        self.data = data
+        self.countries = list(countries)
+        self.indicators = list(indicators)
+        self.years = [int(y) for y in years]
+        self.country_pos = {c: i for i, c in enumerate(self.countries)}
+        self.indicator_pos = {c: i for i, c in enumerate(self.indicators)}
+        self.year_pos = {y: i for i, y in enumerate(self.years)}
+
+    def _country_mask(self, countries):
+        mask = np.zeros(len(self.countries), dtype=bool)
+        pos = [self.country_pos[c] for c in countries if c in self.country_pos]
+        mask[pos] = True
+        return mask
+
+    def series(self, indicator):
+        # Matrix Land x Jahr fuer einen Indikator
+        return self.data[:, self.indicator_pos[indicator], :]
+
+    def top_k(self, indicator, year, k=10, countries=None, ascending=False):
+        # Top/Unterste k Laender in einem Jahr (fehlende Werte werden ignoriert)
+        if indicator not in self.indicator_pos or int(year) not in self.year_pos:
+            return pd.DataFrame({"country_code": [], "value": []})
+        values = self.data[:, self.indicator_pos[indicator], self.year_pos[int(year)]]
+        valid = ~np.isnan(values)
+        if countries is not None:
+            valid &= self._country_mask(countries)
+        idx = np.flatnonzero(valid)
+        order = np.argsort(values[idx], kind="stable")
+        if not ascending:
+            order = order[::-1]
+        idx = idx[order[:k]]
+        return pd.DataFrame({
+            "country_code": [self.countries[i] for i in idx],
+            "value": values[idx],
+        })
+
+
+def _axes(df: pd.DataFrame):
+    countries = sorted(df["country_code"].astype(str).unique().tolist())
+    indicators = sorted(df["indicator_code"].astype(str).unique().tolist())
+    years = pd.to_numeric(df["year"], errors="coerce").dropna().astype(int)
+    # Jahre lueckenlos, damit Nachbarspalten aufeinanderfolgende Jahre sind
+    years = list(range(int(years.min()), int(years.max()) + 1)) if len(years) else []
+    return countries, indicators, years
+
+
+def _fill(data, df, countries, indicators, years):
+    # Vektorisiert: Positionen je Achse ueber Categorical-Codes bestimmen
+    ci = pd.Categorical(df["country_code"].astype(str), categories=countries).codes
+    ii = pd.Categorical(df["indicator_code"].astype(str), categories=indicators).codes
+    yi = pd.to_numeric(df["year"], errors="coerce").to_numpy(dtype=float, na_value=np.nan) - (years[0] if years else 0)
+    values = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    ok = (ci >= 0) & (ii >= 0) & ~np.isnan(yi)
+    data[ci[ok], ii[ok], yi[ok].astype(int)] = values[ok]
+
+
+def cube_from_frame(df: pd.DataFrame):
+    # Wuerfel im Speicher aus dem Long-Format bauen (Fallback ohne Datei)
+    countries, indicators, years = _axes(df)
+    data = np.full((len(countries), len(indicators), len(years)), np.nan)
+    if years:
+        _fill(data, df, countries, indicators, years)
+    return Cube(data, countries, indicators, years)
+
+
+def write_cube(df: pd.DataFrame, cube_dir=CUBE_DIR):
+    # Schreibt das Array unter neuem Dateinamen und schaltet danach den Index um.
+    # Prozesse mit altem mmap lesen so weiter ihre unveraenderte Datei.
+    countries, indicators, years = _axes(df)
+    shape = (len(countries), len(indicators), len(years))
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    path = cube_dir / f"cube_{uuid.uuid4().hex[:12]}.npy"
+    if 0 in shape:
+        # Leere Arrays lassen sich nicht mappen
+        np.save(path, np.empty(shape))
+    else:
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+        data[:] = np.nan
+        _fill(data, df, countries, indicators, years)
+        data.flush()
+        del data
+    # Index (inkl. Dateiname und Shape) atomar ersetzen, damit Array und Index zusammenpassen
+    index_path = cube_dir / CUBE_INDEX_NAME
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "file": path.name,
+            "shape": list(shape),
+            "countries": countries,
+            "indicators": indicators,
+            "years": years,
+        }, f)
+    os.replace(tmp, index_path)
+    _prune(cube_dir, keep=path.name)
+    return path
+
+
+def _prune(cube_dir, keep):
+    # Alte Versionen entfernen (unter Windows evtl. noch gemappt -> naechster Lauf)
+    for old in cube_dir.glob("cube_*.npy"):
+        if old.name != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_cube(cube_dir=CUBE_DIR):
+    # Oeffnet den Wuerfel read-only per mmap (None, wenn noch nicht geschrieben)
+    index_path = cube_dir / CUBE_INDEX_NAME
+    for _ in range(2):
+        if not index_path.exists():
+            return None
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        path = cube_dir / index["file"]
+        shape = tuple(index["shape"])
+        try:
+            data = np.load(path) if 0 in shape else np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            # Gerade durch einen neuen Lauf ersetzt: Index erneut lesen
+            continue
+        return Cube(data, index["countries"], index["indicators"], index["years"])
+    return None
@@ -0,0 +1,95 @@
+# dimensions.py
+# Laender-Dimension: Metadaten, lokalisierte Namen, Uebersetzungen und feste Farben
+import colorsys
+import hashlib
+import json
+import time
+import pandas as pd
+from babel import Locale
+from src.config import COUNTRY_DIM_CSV, COUNTRY_DIM_META, COUNTRY_NAME_LOCALES
+from src.fetch_api import _fetch_paged, _parse_countries
+
+REGION_DE = {
+    "East Asia & Pacific": "Ostasien & Pazifik",
+    "Europe & Central Asia": "Europa & Zentralasien",
+    "Latin America & Caribbean": "Lateinamerika & Karibik",
+    "Middle East, North Africa, Afghanistan & Pakistan": "Nahost, Nordafrika, Afghanistan & Pakistan",
+    "North America": "Nordamerika",
+    "South Asia": "Suedasien",
+    "Sub-Saharan Africa": "Subsahara-Afrika",
+}
+INCOME_DE = {
+    "High income": "Hohes Einkommen",
+    "Upper middle income": "Oberes mittleres Einkommen",
+    "Lower middle income": "Unteres mittleres Einkommen",
+    "Low income": "Niedriges Einkommen",
+    "Not classified": "Nicht klassifiziert",
+}
+
+
+def country_color(name):
+    # Eindeutige Farbe pro Land (MD5 + Golden-Angle), stabil ueber Prozesse hinweg
+    digest = int(hashlib.md5(str(name).encode("utf-8")).hexdigest(), 16)
+    h = (digest % 360) / 360.0
+    h = (h + 0.61803398875) % 1.0
+    s = 0.65 if (digest % 2 == 0) else 0.8
+    v = 0.55 if (digest % 3 == 0) else 0.7
+    r, g, b = colorsys.hsv_to_rgb(h, s, v)
+    return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+
+
+def build_country_dim(countries):
+    # Aus dem get_countries()-Dict eine Tabelle mit allen Anzeige-Spalten bauen
+    dim = pd.DataFrame(list(countries.values()))
+    for lang in COUNTRY_NAME_LOCALES:
+        territories = Locale(lang).territories
+        dim[f"name_{lang}"] = [territories.get(c, n) for c, n in zip(dim["iso2"], dim["name"])]
+    dim["region_de"] = dim["region"].map(REGION_DE).fillna(dim["region"])
+    dim["income_level_de"] = dim["income_level"].map(INCOME_DE).fillna(dim["income_level"])
+    name_de = dim["name_de"] if "name_de" in dim else dim["name"]
+    # Farbe haengt am deutschen Namen, weil die Charts darauf kodieren
+    dim["color"] = name_de.map(country_color)
+    return dim.sort_values("iso2").reset_index(drop=True)
+
+
+def _payload_hash(records):
+    # Inhalts-Hash der Laenderliste: erkennt auch Umbenennungen und Umklassifizierungen
+    payload = json.dumps(records, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def read_country_dim():
+    # Liest die gecachte Dimension ohne Netzwerkzugriff (None, wenn nicht vorhanden)
+    if not COUNTRY_DIM_CSV.exists():
+        return None
+    return pd.read_csv(COUNTRY_DIM_CSV, keep_default_na=False, na_values=[""])
+
+
+def load_country_dim(refresh=False):
+    # Laenderliste einmal abrufen; Dimension nur neu bauen, wenn sich der Inhalt geaendert hat
+    records = _fetch_paged("/country")
+    digest = _payload_hash(records)
+    if not refresh and COUNTRY_DIM_CSV.exists() and COUNTRY_DIM_META.exists():
+        with open(COUNTRY_DIM_META, "r", encoding="utf-8") as f:
+            if json.load(f).get("hash") == digest:
+                return read_country_dim()
+    dim = build_country_dim(_parse_countries(records))
+    COUNTRY_DIM_CSV.parent.mkdir(parents=True, exist_ok=True)
+    dim.to_csv(COUNTRY_DIM_CSV, index=False)
+    with open(COUNTRY_DIM_META, "w", encoding="utf-8") as f:
+        json.dump({"hash": digest, "fetched_at": time.time()}, f)
+    return dim
+
+
+def countries_from_dim(dim):
+    # Gleiche Struktur wie get_countries(): iso2 -> Metadaten
+    cols = ["iso2", "iso3", "name", "region", "income_level", "is_sovereign"]
+    records = dim[cols].to_dict("records")
+    for r in records:
+        r["is_sovereign"] = str(r["is_sovereign"]) == "True"
+    return {r["iso2"]: r for r in records}
+
+
+def color_map(dim):
+    # Deutscher Name -> Farbe
+    return dict(zip(dim["name_de"], dim["color"]))
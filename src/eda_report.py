@@ -0,0 +1,138 @@
+# eda_report.py
+# Statischer EDA-Report (HTML) als Pipeline-Schritt, gecacht je Datenstand
+import hashlib
+import html
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from src.config import EDA_REPORT_HTML, EDA_REPORT_META
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+HIST_BINS = 20
+# Erhoehen, wenn sich die Berechnung aendert, damit gecachte Reports neu erzeugt werden
+REPORT_VERSION = 2
+
+STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #111827; }
+table { border-collapse: collapse; font-size: 0.85em; margin-bottom: 1.5em; }
+th, td { border: 1px solid #e5e7eb; padding: 2px 6px; text-align: right; }
+th { background: #f5f7fa; }
+.bar { background: #0B5FA5; height: 0.8em; display: inline-block; }
+"""
+
+
+def data_version(df: pd.DataFrame):
+    # Inhalts-Hash der Daten (unabhaengig von Dateizeitpunkten)
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def _compact(df: pd.DataFrame):
+    # Nur benoetigte Spalten, Schluessel als Categorical
+    return pd.DataFrame({
+        "country": df["country_code"].astype("category"),
+        "indicator": df["indicator_code"].astype("category"),
+        "year": pd.to_numeric(df["year"], errors="coerce").astype("int32"),
+        "value": pd.to_numeric(df["value"], errors="coerce"),
+    })
+
+
+def _section_overview(data, names):
+    years = data["year"]
+    rows = [
+        ("Zeilen (inkl. leerer Werte)", f"{len(data):,}"),
+        ("Werte", f"{int(data['value'].notna().sum()):,}"),
+        ("Laender", data["country"].nunique()),
+        ("Indikatoren", data["indicator"].nunique()),
+        ("Zeitraum", f"{years.min()}-{years.max()}" if len(years) else "-"),
+    ]
+    body = "".join(f"<tr><th>{k}</th><td>{v}</td></tr>" for k, v in rows)
+    return "<h2>Uebersicht</h2><table>" + body + "</table>"
+
+
+def _section_summary(data, names):
+    summary = data.groupby("indicator", observed=True)["value"].agg(["count", "min", "median", "mean", "max"])
+    # Laender und Zeitraum nur aus Zeilen mit Wert
+    valued = data.dropna(subset=["value"]).groupby("indicator", observed=True)
+    summary["laender"] = valued["country"].nunique()
+    summary["jahr_von"] = valued["year"].min()
+    summary["jahr_bis"] = valued["year"].max()
+    summary.insert(0, "name", summary.index.map(lambda c: names.get(c, c)))
+    return "<h2>Kennzahlen je Indikator</h2>" + summary.to_html(float_format=lambda v: f"{v:,.2f}")
+
+
+def _section_coverage(data, names):
+    # Fehlende Jahre je Land x Indikator (alle Kombinationen, auch ganz ohne Daten);
+    # Zeilen mit leerem Wert (z.B. GDP.PER.CAP.CALC ohne BIP) zaehlen als fehlend
+    n_years = int(data["year"].max() - data["year"].min() + 1) if len(data) else 0
+    present = data.groupby(["country", "indicator"], observed=False)["value"].count().unstack("indicator")
+    missing = n_years - present
+    missing = missing.loc[missing.sum(axis=1) > 0]
+    missing = missing.loc[missing.sum(axis=1).sort_values(ascending=False).index]
+    if missing.empty:
+        return "<h2>Abdeckung</h2><p>Keine fehlenden Jahre.</p>"
+    return (
+        f"<h2>Abdeckung: fehlende Jahre (von {n_years}) je Land x Indikator</h2>"
+        + missing.to_html()
+    )
+
+
+def _histogram_html(values):
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return "<p>Keine Werte.</p>"
+    counts, edges = np.histogram(values, bins=HIST_BINS)
+    top = counts.max() or 1
+    rows = "".join(
+        f"<tr><td>{lo:,.2f}</td><td>{hi:,.2f}</td><td>{n}</td>"
+        f"<td style='text-align:left'><span class='bar' style='width:{200 * n / top:.0f}px'></span></td></tr>"
+        for lo, hi, n in zip(edges[:-1], edges[1:], counts)
+    )
+    return "<table><tr><th>von</th><th>bis</th><th>n</th><th></th></tr>" + rows + "</table>"
+
+
+def _section_distributions(data, names):
+    quant = data.groupby("indicator", observed=True)["value"].quantile(QUANTILES).unstack()
+    quant.columns = [f"p{int(q * 100)}" for q in quant.columns]
+    parts = ["<h2>Verteilungen</h2>", quant.to_html(float_format=lambda v: f"{v:,.2f}")]
+    values = data["value"].to_numpy()
+    codes = data["indicator"].cat.codes.to_numpy()
+    for i, code in enumerate(data["indicator"].cat.categories):
+        parts.append(f"<h3>{html.escape(str(names.get(code, code)))} ({html.escape(str(code))})</h3>")
+        parts.append(_histogram_html(values[codes == i]))
+    return "".join(parts)
+
+
+SECTIONS = [_section_overview, _section_summary, _section_coverage, _section_distributions]
+
+
+def build_eda_report(df: pd.DataFrame, out_path=EDA_REPORT_HTML, meta_path=EDA_REPORT_META, workers=4, force=False):
+    # Erzeugt den Report nur, wenn sich die Daten seit dem letzten Lauf geaendert haben
+    version = data_version(df)
+    if not force and out_path.exists() and meta_path.exists():
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") == version and meta.get("report") == REPORT_VERSION:
+            return False
+    data = _compact(df)
+    names = (
+        df.drop_duplicates("indicator_code").set_index("indicator_code")["indicator_name"].to_dict()
+        if "indicator_name" in df
+        else {}
+    )
+    # Abschnitte unabhaengig voneinander, daher parallel berechnen/rendern
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        sections = list(pool.map(lambda fn: fn(data, names), SECTIONS))
+    page = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        "<title>EDA World Bank</title><style>" + STYLE + "</style></head><body>"
+        f"<h1>EDA World Bank</h1><p>Datenstand: {version[:12]}</p>"
+        + "".join(sections)
+        + "</body></html>"
+    )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(page, encoding="utf-8")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "report": REPORT_VERSION}, f)
+    return True
@@ -0,0 +1,123 @@
+# export.py
+# Export der gefilterten Daten: erst auf Anfrage, in Bloecken geschrieben, mit Datei-Cache
+import hashlib
+import importlib.util
+import json
+import os
+import uuid
+import pandas as pd
+from src.config import CLEAN_CSV, EXPORT_DIR, EXPORT_CACHE_MAX, EXPORT_CHUNK_ROWS
+
+# Anzeigename -> (Dateiendung, MIME-Typ, benoetigtes Paket)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv", None),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", "pyarrow"),
+    "Excel (XLSX)": (
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "openpyxl",
+    ),
+}
+
+
+def available_formats():
+    # Nur Formate anbieten, deren optionale Pakete installiert sind
+    return [
+        name for name, (_, _, pkg) in EXPORT_FORMATS.items()
+        if pkg is None or importlib.util.find_spec(pkg) is not None
+    ]
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows=EXPORT_CHUNK_ROWS):
+    # CSV blockweise als Bytes erzeugen (Header nur im ersten Block)
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+def _write_parquet(df, path, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_export(df: pd.DataFrame, fmt, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Schreibt df im gewaehlten Format nach path
+    ext = EXPORT_FORMATS[fmt][0]
+    if ext == "csv":
+        with open(path, "wb") as f:
+            for block in iter_csv_chunks(df, chunk_rows):
+                f.write(block)
+    elif ext == "parquet":
+        _write_parquet(df, path, chunk_rows)
+    else:
+        # XLSX ist ein Zip-Container und laesst sich nicht blockweise anhaengen
+        df.to_excel(path, index=False, engine="openpyxl")
+    return path
+
+
+def export_cache_key(filters, data_path=CLEAN_CSV):
+    # Schluessel aus Filterzustand + Datenstand (Aenderungszeit der Clean-CSV)
+    version = data_path.stat().st_mtime if data_path.exists() else 0
+    payload = json.dumps({"filters": filters, "version": version}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+
+def _prune_cache(cache_dir, keep):
+    # Nur fertige Dateien aufraeumen; laufende Temp-Dateien anderer Sessions bleiben
+    files = [p for p in cache_dir.glob("export_*") if not p.name.endswith(".tmp")]
+    files = sorted(files, key=_mtime, reverse=True)
+    for old in files[keep:]:
+        old.unlink(missing_ok=True)
+
+
+def cached_export(df: pd.DataFrame, fmt, key, cache_dir=EXPORT_DIR):
+    # Export-Datei aus dem Cache liefern oder einmalig erzeugen
+    ext = EXPORT_FORMATS[fmt][0]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"export_{key}.{ext}"
+    if path.exists():
+        try:
+            # Treffer als zuletzt benutzt markieren, damit das Aufraeumen ihn behaelt
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+    # Eindeutige Temp-Datei, damit parallele Sessions sich nicht ueberschreiben
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    write_export(df, fmt, tmp)
+    os.replace(tmp, path)
+    _prune_cache(cache_dir, EXPORT_CACHE_MAX)
+    return path
+
+
+def read_export(df: pd.DataFrame, fmt, key, cache_dir=EXPORT_DIR):
+    # Export erzeugen/aus dem Cache holen und einmalig einlesen (einmal neu erzeugen,
+    # falls eine andere Session die Datei zwischendurch geloescht hat)
+    for attempt in range(2):
+        path = cached_export(df, fmt, key, cache_dir)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            if attempt:
+                raise
+
+
+def export_mime(fmt):
+    return EXPORT_FORMATS[fmt][1]
+
+
+def export_extension(fmt):
+    return EXPORT_FORMATS[fmt][0]
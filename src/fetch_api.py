@@ -29,6 +29,9 @@ def _fetch_paged(endpoint, params=None):
 def get_countries():
     # Holt Laenderliste und filtert Aggregates heraus
     records = _fetch_paged("/country")
+    return _parse_countries(records)
+def _parse_countries(records):
+    # Klassifiziert API-Records zu iso2 -> Metadaten (gemeinsam fuer sync/async)
     countries = {}
     for c in records:
         region = c.get("region", {}).get("value", "")
@@ -73,10 +76,12 @@ def _normalize_record(r, countries):
         "year": r.get("date"),
         "value": r.get("value"),
     }
-def fetch_indicator_data_all(countries):
-    # Holt Daten fuer alle Laender und alle Indikatoren
+def fetch_indicator_data_all(countries, indicator_codes=None):
+    # Holt Daten fuer alle Laender und alle Indikatoren (Standard: config.INDICATORS)
+    if indicator_codes is None:
+        indicator_codes = list(INDICATORS.keys())
     rows = []
-    for ind_code in INDICATORS.keys():
+    for ind_code in indicator_codes:
         endpoint = f"/country/all/indicator/{ind_code}"
         params = {"date": f"{START_YEAR}:{END_YEAR}"}
         records = _fetch_paged(endpoint, params=params)
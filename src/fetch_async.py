@@ -0,0 +1,108 @@
+# fetch_async.py
+# Asyncio-Client (httpx) fuer die World Bank API, optional mit HTTP/2-Multiplexing
+import asyncio
+from contextlib import asynccontextmanager
+import pandas as pd
+from src.config import (
+    BASE_URL,
+    START_YEAR,
+    END_YEAR,
+    INDICATORS,
+    ASYNC_MAX_IN_FLIGHT,
+    ASYNC_MAX_CONNECTIONS,
+    HTTP2,
+)
+from src.fetch_api import _parse_countries, _normalize_record
+
+
+@asynccontextmanager
+async def _session(http2=HTTP2):
+    # Wenige (bei HTTP/2 gemultiplexte) Verbindungen, viele Requests gleichzeitig
+    import httpx
+    limits = httpx.Limits(
+        max_connections=ASYNC_MAX_CONNECTIONS,
+        max_keepalive_connections=ASYNC_MAX_CONNECTIONS,
+    )
+    async with httpx.AsyncClient(http2=http2, limits=limits, timeout=30) as client:
+        yield client, asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+
+
+async def _gather(coros):
+    # Wie asyncio.gather, bricht bei einem Fehler aber alle uebrigen Tasks ab
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _get_json(client, sem, url, params):
+    async with sem:
+        resp = await client.get(url, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _page_records(data):
+    return (data[1] or []) if isinstance(data, list) and len(data) > 1 else []
+
+
+async def _fetch_paged(client, sem, endpoint, params=None, base_url=BASE_URL):
+    params = dict(params or {})
+    params["format"] = "json"
+    params["per_page"] = 20000
+    url = f"{base_url}{endpoint}"
+    data = await _get_json(client, sem, url, params)
+    if not isinstance(data, list) or len(data) < 2:
+        return []
+    pages = int(data[0].get("pages", 1))
+    all_records = list(data[1] or [])
+    # Restliche Seiten gleichzeitig anfordern, Reihenfolge bleibt erhalten
+    rest = await _gather(
+        _get_json(client, sem, url, {**params, "page": page})
+        for page in range(2, pages + 1)
+    )
+    for data in rest:
+        all_records.extend(_page_records(data))
+    return all_records
+
+
+async def get_countries_async(client, sem, base_url=BASE_URL):
+    records = await _fetch_paged(client, sem, "/country", base_url=base_url)
+    return _parse_countries(records)
+
+
+async def fetch_indicator_data_all_async(client, sem, countries, indicator_codes=None, base_url=BASE_URL):
+    if indicator_codes is None:
+        indicator_codes = list(INDICATORS.keys())
+    params = {"date": f"{START_YEAR}:{END_YEAR}"}
+    results = await _gather(
+        _fetch_paged(client, sem, f"/country/all/indicator/{code}", params, base_url)
+        for code in indicator_codes
+    )
+    rows = []
+    for records in results:
+        for r in records:
+            rec = _normalize_record(r, countries)
+            if rec:
+                rows.append(rec)
+    return pd.DataFrame(rows)
+
+
+def get_countries(base_url=BASE_URL, http2=HTTP2):
+    # Gleicher Vertrag wie fetch_api.get_countries
+    async def run():
+        async with _session(http2) as (client, sem):
+            return await get_countries_async(client, sem, base_url)
+    return asyncio.run(run())
+
+
+def fetch_indicator_data_all(countries, indicator_codes=None, base_url=BASE_URL, http2=HTTP2):
+    # Gleicher Vertrag wie fetch_api.fetch_indicator_data_all
+    async def run():
+        async with _session(http2) as (client, sem):
+            return await fetch_indicator_data_all_async(client, sem, countries, indicator_codes, base_url)
+    return asyncio.run(run())
@@ -3,7 +3,7 @@
 import sqlite3
 import pandas as pd
 from src.config import SQLITE_DB, SCHEMA_PATH
-def load_to_sqlite(df: pd.DataFrame):
+def load_to_sqlite(df: pd.DataFrame, catalog: pd.DataFrame = None, country_dim: pd.DataFrame = None):
     # Alte DB loeschen, damit der Lauf reproduzierbar ist
     if SQLITE_DB.exists():
         SQLITE_DB.unlink()
@@ -19,6 +19,10 @@ def load_to_sqlite(df: pd.DataFrame):
             "country_name_de": "name",
         })
     )
+    # Uebersetzungen, Souveraen-Flag und Farbe aus der Laender-Dimension ergaenzen
+    if country_dim is not None:
+        dim = country_dim[["iso2", "iso3", "region_de", "income_level_de", "is_sovereign", "color"]]
+        countries = countries.merge(dim.drop_duplicates("iso2"), on="iso2", how="left")
     indicators = (
         df[["indicator_code", "indicator_name"]]
         .drop_duplicates()
@@ -27,6 +31,10 @@ def load_to_sqlite(df: pd.DataFrame):
             "indicator_name": "name",
         })
     )
+    # Metadaten (Einheit, Quelle, Topics) aus dem Indikator-Katalog ergaenzen
+    if catalog is not None:
+        meta = catalog.drop(columns=["name"]).drop_duplicates("code")
+        indicators = indicators.merge(meta, on="code", how="left")
     countries.to_sql("countries", conn, if_exists="append", index=False)
     indicators.to_sql("indicators", conn, if_exists="append", index=False)
     country_ids = pd.read_sql_query("SELECT id, iso2 FROM countries", conn)
@@ -0,0 +1,54 @@
+# parallel.py
+# Sharded Ausfuehrung: Cleaning/Checks je Indikator-Gruppe im Prozess-Pool
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from src.transform import clean_data, compute_features, FEATURE_INPUTS, BASE_COLUMNS
+from src.quality_checks import validate
+
+
+def shard_by_indicator(df: pd.DataFrame, n_shards: int):
+    # Indikatoren nach Zeilenzahl auf Shards verteilen (groesste zuerst)
+    sizes = df["indicator_code"].value_counts()
+    n_shards = max(1, min(n_shards, len(sizes)))
+    groups = [[] for _ in range(n_shards)]
+    loads = [0] * n_shards
+    for code, size in sizes.items():
+        i = loads.index(min(loads))
+        groups[i].append(code)
+        loads[i] += size
+    return [df[df["indicator_code"].isin(codes)] for codes in groups if codes]
+
+
+def _process_shard(shard: pd.DataFrame):
+    # Laeuft im Worker: Cleaning + Checks fuer eine Indikator-Gruppe
+    clean = clean_data(shard)
+    return clean, validate(clean)
+
+
+def _merge_checks(all_checks):
+    # Ein Check gilt nur, wenn er in jedem Shard erfuellt ist
+    merged = {}
+    for checks in all_checks:
+        for k, v in checks.items():
+            merged[k] = bool(merged.get(k, True) and v)
+    return merged
+
+
+def run_sharded(raw_df: pd.DataFrame, workers: int):
+    # Gibt (clean_df, checks) zurueck, wie der serielle Ablauf
+    shards = shard_by_indicator(raw_df, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_process_shard, shards))
+    cleaned = [clean for clean, _ in results]
+    all_checks = [checks for _, checks in results]
+    # Nur Formeln ueber mehrere Indikatoren brauchen den Join ueber Shards
+    inputs = pd.concat(
+        [c[c["indicator_code"].isin(FEATURE_INPUTS)] for c in cleaned],
+        ignore_index=True,
+    )
+    features = compute_features(inputs)
+    if features is not None:
+        all_checks.append(validate(features))
+        cleaned = [c[BASE_COLUMNS] for c in cleaned] + [features]
+    clean_df = pd.concat(cleaned, ignore_index=True)
+    return clean_df, _merge_checks(all_checks)
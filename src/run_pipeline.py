@@ -1,48 +1,112 @@
 # run_pipeline.py
 # Orchestriert den gesamten Ablauf
-from src.config import RAW_CSV, CLEAN_CSV, PLOT_PATH, PLOT_POP_CHANGE_TOP, PLOT_POP_CHANGE_BOTTOM, PLOT_GDP_PC
-from src.fetch_api import get_countries, fetch_indicator_data_all
+import argparse
+from src.config import (
+    RAW_CSV,
+    CLEAN_CSV,
+    EDA_REPORT_HTML,
+    PLOT_PATH,
+    PLOT_POP_CHANGE_TOP,
+    PLOT_POP_CHANGE_BOTTOM,
+    PLOT_GDP_PC,
+    FIG_BATCH_DIR,
+    FIG_FORMATS,
+    FETCH_BACKEND,
+    HTTP2,
+)
+from src.fetch_api import fetch_indicator_data_all
+from src import fetch_async
+from src.dimensions import load_country_dim, countries_from_dim
+from src.catalog import load_catalog, resolve_indicators
 from src.transform import clean_data, add_features
 from src.quality_checks import validate
 from src.load_sqlite import load_to_sqlite
+from src.parallel import run_sharded
+from src.cube import write_cube
+from src.eda_report import build_eda_report
 from src.viz import (
+    FigureContext,
+    render_batch,
     plot_top_population,
     plot_population_change_top10,
     plot_population_change_bottom10,
     plot_top_gdp_per_capita,
 )
-def main():
-    # 1) Laender laden
-    countries = get_countries()
-    # 2) Daten fuer alle Laender holen
-    raw_df = fetch_indicator_data_all(countries)
+def main(workers=1, fetch=FETCH_BACKEND, http2=HTTP2):
+    # 1) Laender laden (Dimension wird nur bei Aenderungen upstream neu gebaut)
+    country_dim = load_country_dim()
+    countries = countries_from_dim(country_dim)
+    # 2) Indikator-Katalog laden (gecacht) und Indikatoren bestimmen
+    catalog = load_catalog()
+    indicator_codes = resolve_indicators(catalog)
+    # 3) Daten fuer alle Laender holen
+    if fetch == "async":
+        raw_df = fetch_async.fetch_indicator_data_all(countries, indicator_codes, http2=http2)
+    else:
+        raw_df = fetch_indicator_data_all(countries, indicator_codes)
     # 4) Raw speichern
     RAW_CSV.parent.mkdir(parents=True, exist_ok=True)
     raw_df.to_csv(RAW_CSV, index=False)
-    # 5) Cleaning + Features
-    clean_df = clean_data(raw_df)
-    clean_df = add_features(clean_df)
-    # 6) Checks
-    checks = validate(clean_df)
+    # 5) Cleaning + Features, 6) Checks
+    if workers > 1:
+        # Sharded je Indikator-Gruppe im Prozess-Pool
+        clean_df, checks = run_sharded(raw_df, workers)
+    else:
+        clean_df = clean_data(raw_df)
+        clean_df = add_features(clean_df)
+        checks = validate(clean_df)
     print("Checks:")
     for k, v in checks.items():
         print(f"- {k}: {v}")
     # 7) Processed speichern
     CLEAN_CSV.parent.mkdir(parents=True, exist_ok=True)
     clean_df.to_csv(CLEAN_CSV, index=False)
-    # 8) SQLite laden
-    load_to_sqlite(clean_df)
+    # 8) SQLite laden (ein Writer im Hauptprozess)
+    load_to_sqlite(clean_df, catalog, country_dim)
+    # Wuerfel (Land x Indikator x Jahr) fuer schnelle Slices im Dashboard
+    cube_path = write_cube(clean_df)
     # 9) Plot speichern
     PLOT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    plot_top_population(clean_df, PLOT_PATH)
-    plot_population_change_top10(clean_df, PLOT_POP_CHANGE_TOP)
-    plot_population_change_bottom10(clean_df, PLOT_POP_CHANGE_BOTTOM)
-    plot_top_gdp_per_capita(clean_df, PLOT_GDP_PC)
+    # Gemeinsame Vorberechnung fuer alle Plots
+    fig_ctx = FigureContext(clean_df)
+    plot_top_population(clean_df, PLOT_PATH, fig_ctx, FIG_FORMATS)
+    plot_population_change_top10(clean_df, PLOT_POP_CHANGE_TOP, fig_ctx, FIG_FORMATS)
+    plot_population_change_bottom10(clean_df, PLOT_POP_CHANGE_BOTTOM, fig_ctx, FIG_FORMATS)
+    plot_top_gdp_per_capita(clean_df, PLOT_GDP_PC, fig_ctx, FIG_FORMATS)
+    # Top/Unterste 10 fuer alle Indikatoren plus Small Multiples
+    batch_paths = render_batch(clean_df, FIG_BATCH_DIR, formats=FIG_FORMATS, small_multiples=True, ctx=fig_ctx)
+    # 10) EDA-Report (nur neu, wenn sich die Daten geaendert haben)
+    eda_built = build_eda_report(clean_df, workers=max(workers, 4))
     print(f"Saved: {RAW_CSV}")
     print(f"Saved: {CLEAN_CSV}")
+    print(f"Saved: {cube_path}")
     print(f"Saved: {PLOT_PATH}")
     print(f"Saved: {PLOT_POP_CHANGE_TOP}")
     print(f"Saved: {PLOT_POP_CHANGE_BOTTOM}")
     print(f"Saved: {PLOT_GDP_PC}")
+    print(f"Saved: {len(batch_paths)} Plots in {FIG_BATCH_DIR}")
+    print(f"{'Saved' if eda_built else 'Unchanged'}: {EDA_REPORT_HTML}")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="World-Bank-Pipeline ausfuehren")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Anzahl Prozesse fuer Cleaning/Checks (1 = seriell)",
+    )
+    parser.add_argument(
+        "--fetch",
+        choices=["requests", "async"],
+        default=FETCH_BACKEND,
+        help="Abruf-Backend (async benoetigt httpx)",
+    )
+    parser.add_argument(
+        "--http2",
+        action=argparse.BooleanOptionalAction,
+        default=HTTP2,
+        help="HTTP/2 fuer das async-Backend an/aus (benoetigt httpx[http2])",
+    )
+    return parser.parse_args(argv)
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(workers=args.workers, fetch=args.fetch, http2=args.http2)
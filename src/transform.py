@@ -21,49 +21,51 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     return df
-def add_features(df: pd.DataFrame) -> pd.DataFrame:
-    # Beispiel: berechnet GDP pro Kopf, wenn GDP und Population da sind
-    df = df.copy()
-    wide = df.pivot_table(
+# Indikatoren, die in Formeln ueber mehrere Indikatoren vorkommen
+FEATURE_INPUTS = ["NY.GDP.MKTP.CD", "SP.POP.TOTL"]
+BASE_COLUMNS = [
+    "country_code",
+    "country_name",
+    "country_name_de",
+    "region",
+    "income_level",
+    "indicator_code",
+    "indicator_name",
+    "year",
+    "value",
+]
+
+
+def compute_features(df: pd.DataFrame):
+    # Berechnet nur die neuen Feature-Zeilen (None, wenn Eingaben fehlen)
+    inputs = df[df["indicator_code"].isin(FEATURE_INPUTS)]
+    wide = inputs.pivot_table(
         index=["country_code", "year"],
         columns="indicator_code",
         values="value",
         aggfunc="first",
     )
-    if "NY.GDP.MKTP.CD" in wide.columns and "SP.POP.TOTL" in wide.columns:
-        wide["GDP_per_capita_calc"] = wide["NY.GDP.MKTP.CD"] / wide["SP.POP.TOTL"]
-        gpc = wide[["GDP_per_capita_calc"]].reset_index()
-        gpc["indicator_code"] = "GDP.PER.CAP.CALC"
-        gpc["indicator_name"] = "GDP per capita (calc)"
-        gpc["value"] = gpc["GDP_per_capita_calc"]
-        gpc = gpc[["country_code", "year", "indicator_code", "indicator_name", "value"]]
+    if "NY.GDP.MKTP.CD" not in wide.columns or "SP.POP.TOTL" not in wide.columns:
+        return None
+    wide["GDP_per_capita_calc"] = wide["NY.GDP.MKTP.CD"] / wide["SP.POP.TOTL"]
+    gpc = wide[["GDP_per_capita_calc"]].reset_index()
+    gpc["indicator_code"] = "GDP.PER.CAP.CALC"
+    gpc["indicator_name"] = "GDP per capita (calc)"
+    gpc["value"] = gpc["GDP_per_capita_calc"]
+    gpc = gpc[["country_code", "year", "indicator_code", "indicator_name", "value"]]
+    # Namen/Region/Income fuer die neuen Zeilen aus dem Original ziehen
+    meta = inputs.drop_duplicates("country_code")[
+        ["country_code", "country_name", "country_name_de", "region", "income_level"]
+    ]
+    gpc = gpc.merge(meta, on="country_code", how="left")
+    return gpc[BASE_COLUMNS]
+
+
+def add_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Beispiel: berechnet GDP pro Kopf, wenn GDP und Population da sind
+    df = df.copy()
+    gpc = compute_features(df)
+    if gpc is not None:
         # Basis-Spalten aus Original behalten
-        base = df[[
-            "country_code",
-            "country_name",
-            "country_name_de",
-            "region",
-            "income_level",
-            "indicator_code",
-            "indicator_name",
-            "year",
-            "value",
-        ]]
-        # Namen/Region/Income fuer die neuen Zeilen aus dem Original ziehen
-        meta = df.drop_duplicates("country_code")[
-            ["country_code", "country_name", "country_name_de", "region", "income_level"]
-        ]
-        gpc = gpc.merge(meta, on="country_code", how="left")
-        gpc = gpc[[
-            "country_code",
-            "country_name",
-            "country_name_de",
-            "region",
-            "income_level",
-            "indicator_code",
-            "indicator_name",
-            "year",
-            "value",
-        ]]
-        df = pd.concat([base, gpc], ignore_index=True)
+        df = pd.concat([df[BASE_COLUMNS], gpc], ignore_index=True)
     return df
@@ -1,107 +1,210 @@
 # viz.py
 # Erstellt einfache Plots fuer den Report
+import math
+from functools import cached_property
+from pathlib import Path
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
+from src.config import FIG_DPI, FIG_GRID_PER_PAGE, FIG_GRID_COLS
+from src.compare import Comparison, window_label
+from src.catalog import read_catalog, catalog_index, indicator_info
 
 
-def plot_top_population(df, out_path):
-    # Letztes Jahr in den Daten
-    last_year = int(df["year"].max())
-    pop = df[
-        (df["indicator_code"] == "SP.POP.TOTL") & (df["year"] == last_year)
-    ]
-    if pop.empty:
+class FigureContext:
+    # Gemeinsame Vorberechnung fuer viele Plots: wird je Datenstand nur einmal gebaut
+    def __init__(self, df):
+        self.df = df
+
+    @cached_property
+    def latest(self):
+        # Jeweils letztes Jahr mit Werten je Indikator, einmal gruppiert und nach Wert sortiert
+        data = self.df.dropna(subset=["value"])
+        latest = data[data["year"] == data.groupby("indicator_code")["year"].transform("max")]
+        return {code: g.sort_values("value") for code, g in latest.groupby("indicator_code")}
+
+    @cached_property
+    def latest_year(self):
+        return {code: int(g["year"].iloc[0]) for code, g in self.latest.items()}
+
+    @cached_property
+    def comparison(self):
+        return Comparison.from_frame(self.df)
+
+    @cached_property
+    def population_change(self):
+        return _population_change_table(self.df, self.comparison)
+
+    @cached_property
+    def catalog(self):
+        return catalog_index(read_catalog())
+
+    def info(self, code):
+        name = self.latest[code]["indicator_name"].iloc[0] if code in self.latest else code
+        return indicator_info(self.catalog, code, name)
+
+
+def _labels(frame):
+    return frame["country_name_de"] if "country_name_de" in frame else frame["country_name"]
+
+
+def _save(fig, out_path, formats=None):
+    # Speichert eine Figur in allen gewuenschten Formaten (png, svg, pdf) und schliesst sie
+    out_path = Path(out_path)
+    formats = formats or [out_path.suffix.lstrip(".") or "png"]
+    fig.tight_layout()
+    paths = []
+    for fmt in formats:
+        path = out_path.with_suffix(f".{fmt}")
+        fig.savefig(path, dpi=FIG_DPI)
+        paths.append(path)
+    plt.close(fig)
+    return paths
+
+
+def plot_top_population(df, out_path, ctx=None, formats=None):
+    ctx = ctx or FigureContext(df)
+    pop = ctx.latest.get("SP.POP.TOTL")
+    if pop is None or pop.empty:
         return False
-    top = (
-        pop.sort_values("value", ascending=False)
-           .head(10)
-           .sort_values("value")
-    )
+    # Letztes Jahr mit Bevoelkerungsdaten
+    last_year = ctx.latest_year["SP.POP.TOTL"]
+    top = pop.tail(10)
     fig, ax = plt.subplots(figsize=(10, 6))
-    labels = top["country_name_de"] if "country_name_de" in top else top["country_name"]
-    ax.barh(labels, top["value"])
+    ax.barh(_labels(top), top["value"])
     ax.set_title(f"Top 10 Bevoelkerung ({last_year})")
     ax.set_xlabel("Bevoelkerung in Milliarden")
     ax.set_ylabel("Land")
     ax.grid(axis="x", linestyle="--", alpha=0.5)
     ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{x/1e9:.1f} Milliarden"))
-    plt.tight_layout()
-    fig.savefig(out_path, dpi=150)
+    _save(fig, out_path, formats)
     return True
 
 
-def _population_change_table(df):
+def _population_change_table(df, comparison=None):
     # Prozentuale Veraenderung ueber den Zeitraum je Land
-    pop = df[df["indicator_code"] == "SP.POP.TOTL"].copy()
-    if pop.empty:
+    merged = (comparison or Comparison.from_frame(df)).change("SP.POP.TOTL")
+    if merged.empty:
         return None
-    first_year = int(pop["year"].min())
-    last_year = int(pop["year"].max())
-    first = pop[pop["year"] == first_year][["country_code", "value"]].rename(columns={"value": "v_start"})
-    last = pop[pop["year"] == last_year][["country_code", "value"]].rename(columns={"value": "v_end"})
-    meta = pop.drop_duplicates("country_code")[["country_code", "country_name", "country_name_de"]]
-    merged = meta.merge(first, on="country_code").merge(last, on="country_code")
-    merged["rel_change_pct"] = ((merged["v_end"] - merged["v_start"]) / merged["v_start"]) * 100
+    merged = merged.copy()
     merged["rel_change_pct"] = merged["rel_change_pct"].round(2)
-    return merged
+    return merged.dropna(subset=["rel_change_pct"])
+
 
+def _window_title(merged):
+    return window_label(merged["start_year"].min(), merged["end_year"].max())
 
-def plot_population_change_top10(df, out_path):
+
+def plot_population_change_top10(df, out_path, ctx=None, formats=None):
     # Top 10 Laender mit hoechster relativer Bevoelkerungsveraenderung
-    merged = _population_change_table(df)
+    ctx = ctx or FigureContext(df)
+    merged = ctx.population_change
     if merged is None or merged.empty:
         return False
     top = merged.sort_values("rel_change_pct", ascending=False).head(10).sort_values("rel_change_pct")
-    labels = top["country_name_de"] if "country_name_de" in top else top["country_name"]
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(labels, top["rel_change_pct"])
-    ax.set_title("Top 10: Relativer Bevoelkerungswandel (5 Jahre)")
+    ax.barh(_labels(top), top["rel_change_pct"])
+    ax.set_title(f"Top 10: Relativer Bevoelkerungswandel ({_window_title(merged)})")
     ax.set_xlabel("Veraenderung in %")
     ax.set_ylabel("Land")
     ax.grid(axis="x", linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    fig.savefig(out_path, dpi=150)
+    _save(fig, out_path, formats)
     return True
 
 
-def plot_population_change_bottom10(df, out_path):
+def plot_population_change_bottom10(df, out_path, ctx=None, formats=None):
     # Laender mit der geringsten relativen Bevoelkerungsveraenderung
-    merged = _population_change_table(df)
+    ctx = ctx or FigureContext(df)
+    merged = ctx.population_change
     if merged is None or merged.empty:
         return False
     bottom = merged.sort_values("rel_change_pct", ascending=True).head(10)
-    labels = bottom["country_name_de"] if "country_name_de" in bottom else bottom["country_name"]
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(labels, bottom["rel_change_pct"])
-    ax.set_title("Top 10: Geringster Bevoelkerungswandel (5 Jahre)")
+    ax.barh(_labels(bottom), bottom["rel_change_pct"])
+    ax.set_title(f"Top 10: Geringster Bevoelkerungswandel ({_window_title(merged)})")
     ax.set_xlabel("Veraenderung in %")
     ax.set_ylabel("Land")
     ax.grid(axis="x", linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    fig.savefig(out_path, dpi=150)
+    _save(fig, out_path, formats)
     return True
 
 
-def plot_top_gdp_per_capita(df, out_path):
-    # Top 10 GDP pro Kopf (berechnet) im letzten Jahr
-    last_year = int(df["year"].max())
-    gpc = df[
-        (df["indicator_code"] == "GDP.PER.CAP.CALC") & (df["year"] == last_year)
-    ]
-    if gpc.empty:
+def plot_top_gdp_per_capita(df, out_path, ctx=None, formats=None):
+    # Top 10 GDP pro Kopf (berechnet) im letzten Jahr mit Werten
+    ctx = ctx or FigureContext(df)
+    gpc = ctx.latest.get("GDP.PER.CAP.CALC")
+    if gpc is None or gpc.empty:
         return False
-    top = (
-        gpc.sort_values("value", ascending=False)
-           .head(10)
-           .sort_values("value")
-    )
+    last_year = ctx.latest_year["GDP.PER.CAP.CALC"]
+    top = gpc.tail(10)
     fig, ax = plt.subplots(figsize=(10, 6))
-    labels = top["country_name_de"] if "country_name_de" in top else top["country_name"]
-    ax.barh(labels, top["value"])
+    ax.barh(_labels(top), top["value"])
     ax.set_title(f"Top 10 BIP pro Kopf ({last_year})")
     ax.set_xlabel("BIP pro Kopf (berechnet)")
     ax.set_ylabel("Land")
     ax.grid(axis="x", linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    fig.savefig(out_path, dpi=150)
+    _save(fig, out_path, formats)
     return True
+
+
+def _ranked(ctx, code, variant, k):
+    # Top: groesste Werte oben; Bottom: kleinste Werte oben
+    ranked = ctx.latest[code]
+    return ranked.tail(k) if variant == "top" else ranked.head(k).iloc[::-1]
+
+
+def _draw_ranking(ax, ctx, code, variant, k, compact=False):
+    info = ctx.info(code)
+    rows = _ranked(ctx, code, variant, k)
+    ax.barh(_labels(rows), rows["value"] / float(info["scale_factor"] or 1.0))
+    title = "Top" if variant == "top" else "Unterste"
+    ax.set_title(f"{title} {k}: {info['name_de']} ({ctx.latest_year[code]})", fontsize=9 if compact else None)
+    ax.set_xlabel(info["unit_label"])
+    ax.grid(axis="x", linestyle="--", alpha=0.5)
+    if compact:
+        ax.tick_params(labelsize=7)
+    else:
+        ax.set_ylabel("Land")
+
+
+def _slug(code):
+    return code.replace(".", "_").lower()
+
+
+def render_batch(df, out_dir, indicators=None, variants=("top", "bottom"), formats=("png",), k=10, small_multiples=False, ctx=None):
+    # Viele Plots in einem Durchlauf: Daten werden einmal vorbereitet, danach nur gezeichnet
+    ctx = ctx or FigureContext(df)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    codes = [c for c in (indicators or sorted(ctx.latest)) if c in ctx.latest]
+    paths = []
+    for code in codes:
+        for variant in variants:
+            fig, ax = plt.subplots(figsize=(10, 6))
+            _draw_ranking(ax, ctx, code, variant, k)
+            paths += _save(fig, out_dir / f"{_slug(code)}_{variant}{k}", formats)
+    if small_multiples and codes:
+        for variant in variants:
+            paths += plot_small_multiples(df, out_dir / f"small_multiples_{variant}{k}", codes, variant, k, formats, ctx)
+    return paths
+
+
+def plot_small_multiples(df, out_path, indicators=None, variant="top", k=10, formats=None, ctx=None, per_page=FIG_GRID_PER_PAGE):
+    # Raster mit einem kleinen Ranking-Plot je Indikator, seitenweise mit fester Groesse
+    ctx = ctx or FigureContext(df)
+    out_path = Path(out_path)
+    codes = [c for c in (indicators or sorted(ctx.latest)) if c in ctx.latest]
+    # Seiten aus frueheren Laeufen entfernen (sonst bleiben ueberzaehlige Seiten liegen)
+    for old in out_path.parent.glob(f"{out_path.stem}_p*.*"):
+        old.unlink(missing_ok=True)
+    cols = FIG_GRID_COLS
+    rows = math.ceil(per_page / cols)
+    paths = []
+    for page, start in enumerate(range(0, len(codes), per_page), start=1):
+        page_codes = codes[start:start + per_page]
+        fig, axes = plt.subplots(rows, cols, figsize=(5 * cols, 3.5 * rows), squeeze=False)
+        for ax, code in zip(axes.flat, page_codes):
+            _draw_ranking(ax, ctx, code, variant, k, compact=True)
+        for ax in list(axes.flat)[len(page_codes):]:
+            ax.set_visible(False)
+        paths += _save(fig, out_path.with_name(f"{out_path.stem}_p{page:02d}"), formats)
+    return paths